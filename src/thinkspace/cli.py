@@ -6,10 +6,7 @@ from pathlib import Path
 from typing import List, Optional
 
 import typer
-from rich import box
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 from rich.text import Text
 
 from . import __version__
@@ -17,29 +14,34 @@ from .context import detect_project
 from .storage import (
   connect,
   db_path,
-  delete_note,
+  delete_notes,
   get_note,
   insert_note,
+  iter_all_notes,
   iter_recent,
+  normalize_tags,
   search_notes,
   top_tags,
 )
 
+# Table/Panel/box are imported inside the commands that render them so
+# that lightweight commands (db-path-cmd, export, completion) start faster.
+
 app = typer.Typer(
   add_completion=True,
   help='🧠 thinkspace — Context‑Aware Scratchpad for Coders',
 )
 
-console = Console()
+console = Console(highlight=False)
+
+_TOKEN_SPLIT = re.compile(r'[,\s]+')
+_WS_TABLE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
 
 
 def _auto_time_tags(dt: Optional[datetime] = None) -> list[str]:
   dt = dt or datetime.now(timezone.utc)
-  return [
-    f'y:{dt:%Y}',
-    f'ym:{dt:%Y-%m}',
-    f'ymd:{dt:%Y-%m-%d}',
-  ]
+  ymd = f'{dt:%Y-%m-%d}'
+  return [f'y:{ymd[:4]}', f'ym:{ymd[:7]}', f'ymd:{ymd}']
 
 
 def _project_tag(name: str) -> str:
@@ -52,13 +54,28 @@ def _escape(s: str) -> str:
 
 
 def _format_snippet(text: str, max_len: int = 60) -> str:
-  snippet = text.strip().replace('\n', ' ')
+  snippet = text.translate(_WS_TABLE).strip()
   if len(snippet) > max_len:
     return snippet[: max_len - 1] + '…'
   return snippet
 
 
+def _highlight(snippet: str, pattern: re.Pattern[str]) -> Text:
+  # Build styled spans directly so Rich never has to parse markup
+  out = Text()
+  pos = 0
+  for m in pattern.finditer(snippet):
+    out.append(snippet[pos : m.start()])
+    out.append(m.group(0), style='reverse')
+    pos = m.end()
+  out.append(snippet[pos:])
+  return out
+
+
 def _interactive_select_notes(conn, *, limit: int) -> list[int]:
+  from rich import box
+  from rich.table import Table
+
   notes = list(iter_recent(conn, limit=limit))
   if not notes:
     console.print('[dim]No recent notes to choose from.[/]')
@@ -103,7 +120,7 @@ def _interactive_select_notes(conn, *, limit: int) -> list[int]:
       console.print('[yellow]No notes selected yet.[/]')
       continue
 
-    tokens = [tok for tok in re.split(r'[,\s]+', raw) if tok]
+    tokens = [tok for tok in _TOKEN_SPLIT.split(raw) if tok]
     invalid: list[str] = []
     for tok in tokens:
       try:
@@ -128,6 +145,8 @@ def _interactive_select_notes(conn, *, limit: int) -> list[int]:
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
   if ctx.invoked_subcommand is None:
+    from rich.panel import Panel
+
     console.print(
       Panel.fit(
         Text.from_markup(
@@ -151,6 +170,8 @@ def note(
     None, '--tag', '-t', help='Optional manual tag(s). Repeat for multiple.'
   ),
 ):
+  from rich.panel import Panel
+
   full_text = ' '.join(text).strip()
   if not full_text:
     raise typer.BadParameter('Note text cannot be empty.')
@@ -159,6 +180,8 @@ def note(
   tags = [_project_tag(project_name), *_auto_time_tags()]
   if tag:
     tags.extend(tag)
+  # Show exactly what gets stored
+  tags = normalize_tags(tags)
 
   conn = connect()
   new_id = insert_note(conn, full_text, project_name, tags, Path.cwd())
@@ -203,28 +226,26 @@ def search(
     console.print('🙈 No matches.')
     raise typer.Exit()
 
-  table = Table(title='🔎 Results', box=box.SIMPLE_HEAVY)
-  table.add_column('ID', justify='right', style='dim')
+  from rich import box
+  from rich.table import Table
+
+  table = Table(title='🔎 Results', box=box.SIMPLE, show_edge=False)
+  table.add_column('ID', justify='right', style='dim', no_wrap=True)
   table.add_column('Snippet')
   table.add_column('Project', style='cyan')
   table.add_column('Tags', style='magenta')
   table.add_column('When', style='yellow')
 
-  pattern = re.compile('|'.join(re.escape(t) for t in q.split()), re.IGNORECASE)
+  terms = tuple(re.escape(t) for t in q.split())
+  pattern = re.compile('|'.join(terms), re.IGNORECASE)
   for n in rows:
-    snippet = n.text.strip().replace('\n', ' ')
-    if len(snippet) > 120:
-      snippet = snippet[:117] + '…'
-
-    def high(m):
-      return f'[reverse]{m.group(0)}[/reverse]'
-
-    try:
-      snippet_hl = pattern.sub(high, snippet)
-    except re.error:
-      snippet_hl = snippet
-
-    table.add_row(str(n.id), snippet_hl, n.project, n.tags, n.created_at)
+    table.add_row(
+      str(n.id),
+      _highlight(_format_snippet(n.text, 120), pattern),
+      Text(n.project),
+      Text(n.tags),
+      n.created_at,
+    )
 
   console.print(table)
 
@@ -233,18 +254,25 @@ def search(
 def list_notes(
   limit: int = typer.Option(20, help='How many notes to show'),
 ):
+  from rich import box
+  from rich.table import Table
+
   conn = connect()
-  table = Table(title='🧾 Recent notes', box=box.SIMPLE_HEAVY)
-  table.add_column('ID', justify='right', style='dim')
+  table = Table(title='🧾 Recent notes', box=box.SIMPLE, show_edge=False)
+  table.add_column('ID', justify='right', style='dim', no_wrap=True)
   table.add_column('Text')
   table.add_column('Project', style='cyan')
   table.add_column('Tags', style='magenta')
   table.add_column('When', style='yellow')
   for n in iter_recent(conn, limit=limit):
-    txt = n.text.strip().replace('\n', ' ')
-    if len(txt) > 120:
-      txt = txt[:117] + '…'
-    table.add_row(str(n.id), txt, n.project, n.tags, n.created_at)
+    # Data cells never contain markup; pass Text so Rich skips parsing
+    table.add_row(
+      str(n.id),
+      Text(_format_snippet(n.text, 120)),
+      Text(n.project),
+      Text(n.tags),
+      n.created_at,
+    )
   console.print(table)
 
 
@@ -280,18 +308,13 @@ def delete(
     target_ids.extend(note_id)
 
   # Deduplicate while preserving order
-  deduped: list[int] = []
-  seen: set[int] = set()
-  for nid in target_ids:
-    if nid in seen:
-      continue
-    deduped.append(nid)
-    seen.add(nid)
+  deduped = list(dict.fromkeys(target_ids))
 
   if not deduped:
     console.print('[dim]No notes selected for deletion.[/]')
     return
 
+  confirmed: list[int] = []
   for nid in deduped:
     note = get_note(conn, nid)
     if not note:
@@ -307,7 +330,11 @@ def delete(
         console.print(f'[dim]Skipped note #{nid}[/]')
         continue
 
-    if delete_note(conn, nid):
+    confirmed.append(nid)
+
+  deleted = delete_notes(conn, confirmed)
+  for nid in confirmed:
+    if nid in deleted:
       console.print(f'🗑️  Deleted note #{nid}.')
     else:
       console.print(f'[yellow]Note #{nid} could not be deleted.[/]')
@@ -323,6 +350,9 @@ def tags():
     )
     raise typer.Exit()
 
+  from rich import box
+  from rich.table import Table
+
   table = Table(title='🏷️ Top tags', box=box.SIMPLE_HEAVY)
   table.add_column('Tag', style='magenta')
   table.add_column('Count', justify='right', style='yellow')
@@ -346,24 +376,20 @@ def export(
   ),
 ):
   conn = connect()
-  rows = search_notes(conn, query='', project=project, limit=10_000)
-  if not rows:
-    from .storage import iter_recent
-
-    rows = list(iter_recent(conn, limit=10_000))
-
-  lines = ['# 🧠 Thinkspace Export\n']
-  for n in rows[::-1]:
-    lines.append(f'## Note #{n.id}')
-    lines.append(f'- **When:** {n.created_at}')
-    lines.append(f'- **Project:** {n.project}')
-    lines.append(f'- **Tags:** {n.tags}')
-    lines.append('')
-    lines.append(n.text)
-    lines.append('')
-
-  out.write_text('\n'.join(lines), encoding='utf-8')
-  console.print(f'📤 Exported {len(rows)} notes → [bold]{out}[/bold]')
+  count = 0
+  with out.open('w', encoding='utf-8', buffering=1 << 20) as f:
+    f.write('# 🧠 Thinkspace Export\n')
+    for n in iter_all_notes(conn, project):
+      f.write(
+        f'\n## Note #{n.id}\n'
+        f'- **When:** {n.created_at}\n'
+        f'- **Project:** {n.project}\n'
+        f'- **Tags:** {n.tags}\n'
+        f'\n{n.text}\n'
+      )
+      count += 1
+
+  console.print(f'📤 Exported {count} notes → [bold]{out}[/bold]')
 
 
 if __name__ == '__main__':
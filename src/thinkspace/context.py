@@ -1,34 +1,30 @@
 from __future__ import annotations
 
-import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
 
-
-def _git(*args: str) -> Optional[str]:
-  try:
-    out = subprocess.check_output(['git', *args], stderr=subprocess.DEVNULL)
-    return out.decode().strip()
-  except Exception:
-    return None
+_PROJECT_MARKERS = ('pyproject.toml', 'package.json', 'requirements.txt')
 
 
 def detect_project(cwd: Optional[Path] = None) -> Tuple[str, Path]:
   """Determine a sensible project name and root based on Git;
   fall back to current directory name.
   """
-  cwd = cwd or Path.cwd()
-  toplevel = _git('rev-parse', '--show-toplevel')
-  if toplevel:
-    root = Path(toplevel)
-    name = root.name
-    return name, root
+  here = (cwd or Path.cwd()).resolve()
+  # Walk up once. The nearest `.git` (a directory, or a file for worktrees
+  # and submodules) wins outright; otherwise remember the nearest folder
+  # containing a project file.
+  nearest_marker: Optional[Path] = None
+  for p in (here, *here.parents):
+    if (p / '.git').exists():
+      return p.name, p
+    if nearest_marker is None and any(
+      (p / marker).exists() for marker in _PROJECT_MARKERS
+    ):
+      nearest_marker = p
 
-  # Fallback to nearest folder containing a project file
-  for marker in ('.git', 'pyproject.toml', 'package.json', 'requirements.txt'):
-    for p in [cwd, *cwd.resolve().parents]:
-      if (p / marker).exists():
-        return p.name, p
+  if nearest_marker is not None:
+    return nearest_marker.name, nearest_marker
 
   # Final fallback: current dir
-  return cwd.resolve().name, cwd.resolve()
+  return here.name, here
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import atexit
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -18,12 +19,50 @@ def db_path() -> Path:
   return data_dir / 'notes.db'
 
 
+class _Connection(sqlite3.Connection):
+  """sqlite3 connection that can carry per-connection cached state."""
+
+  _has_fts5: Optional[bool] = None
+  _insert_cur: Optional[sqlite3.Cursor] = None
+
+  def close(self) -> None:
+    # Closing the shared connection must not leave a dead one cached
+    global _CONN
+    if _CONN is self:
+      _CONN = None
+    super().close()
+
+
+_CONN: Optional[_Connection] = None
+
+
 def connect() -> sqlite3.Connection:
-  path = db_path()
-  conn = sqlite3.connect(path)
-  conn.row_factory = sqlite3.Row
-  _ensure_schema(conn)
-  return conn
+  """Return the process-wide connection, opening it on first use."""
+  global _CONN
+  if _CONN is None:
+    conn = sqlite3.connect(db_path(), factory=_Connection)
+    conn.row_factory = sqlite3.Row
+    _configure(conn)
+    _ensure_schema(conn)
+    _CONN = conn
+  return _CONN
+
+
+def _reset_connection() -> None:
+  if _CONN is not None:
+    _CONN.close()
+
+
+atexit.register(_reset_connection)
+
+
+def _configure(conn: sqlite3.Connection) -> None:
+  # WAL + synchronous=NORMAL avoids an fsync per commit; fine for local data
+  conn.execute('PRAGMA journal_mode=WAL;')
+  conn.execute('PRAGMA synchronous=NORMAL;')
+  conn.execute('PRAGMA temp_store=MEMORY;')
+  conn.execute('PRAGMA cache_size=-20000;')
+  conn.execute('PRAGMA mmap_size=268435456;')
 
 
 def _ensure_schema(conn: sqlite3.Connection) -> None:
@@ -40,14 +79,21 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
         );
         """
   )
+  has_indexes = cur.execute(
+    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_notes_created_at';"
+  ).fetchone()
+  cur.executescript(
+    """
+        CREATE INDEX IF NOT EXISTS idx_notes_project_id ON notes(project, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_notes_created_at ON notes(created_at);
+        """
+  )
+  if not has_indexes:
+    # Give the planner statistics for the new indexes on existing data
+    cur.execute('ANALYZE;')
   # Try to create FTS5 table; ignore if extension not available
   try:
-    cur.execute(
-      """
-            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts
-            USING fts5(text, project, tags, content='notes', content_rowid='id');
-            """
-    )
+    _ensure_fts_table(cur)
     # Ensure content sync triggers
     cur.executescript(
       """
@@ -63,13 +109,65 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
             END;
             """
     )
+    fts_ok = True
   except sqlite3.OperationalError:
     # FTS5 not available; searches will fallback
-    pass
+    fts_ok = False
+  if isinstance(conn, _Connection):
+    # Bootstrap already proved (or disproved) FTS5; spare has_fts5 a probe
+    conn._has_fts5 = fts_ok
   conn.commit()
 
 
-def has_fts5(conn: sqlite3.Connection) -> bool:
+_FTS_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts
+    USING fts5(
+        text, project, tags, content='notes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    );
+    """
+
+# `remove_diacritics 2` needs SQLite 3.27+; every FTS5 build accepts 1
+_FTS_DDL_COMPAT = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts
+    USING fts5(
+        text, project, tags, content='notes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 1', prefix='2 3 4'
+    );
+    """
+
+
+def _ensure_fts_table(cur: sqlite3.Cursor) -> None:
+  row = cur.execute(
+    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts';"
+  ).fetchone()
+  if row is not None and "prefix='2 3 4'" in row[0]:
+    return
+  # Missing, or built with the old default tokenizer and no prefix indexes:
+  # (re)create it and rebuild from notes. Each attempt runs in a savepoint so
+  # a rejected definition leaves the previous table in place.
+  error: Optional[sqlite3.OperationalError] = None
+  for ddl in (_FTS_DDL, _FTS_DDL_COMPAT):
+    cur.execute('SAVEPOINT fts_schema;')
+    try:
+      if row is not None:
+        cur.execute('DROP TABLE notes_fts;')
+      cur.execute(ddl)
+      cur.execute("INSERT INTO notes_fts(notes_fts) VALUES('rebuild');")
+    except sqlite3.OperationalError as exc:
+      cur.execute('ROLLBACK TO fts_schema;')
+      cur.execute('RELEASE fts_schema;')
+      error = exc
+      continue
+    cur.execute('RELEASE fts_schema;')
+    return
+  # Neither definition was accepted. A legacy table, if any, still works and
+  # its triggers keep it in sync, so only fail when there is nothing to use.
+  if row is None and error is not None:
+    raise error
+
+
+def _probe_fts5(conn: sqlite3.Connection) -> bool:
   try:
     conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS __ftscheck USING fts5(x);')
     conn.execute('DROP TABLE IF EXISTS __ftscheck;')
@@ -78,6 +176,18 @@ def has_fts5(conn: sqlite3.Connection) -> bool:
     return False
 
 
+def has_fts5(conn: sqlite3.Connection) -> bool:
+  # Connections from connect() know this from schema bootstrap; anything
+  # else is probed (DDL) once and cached where possible
+  cached = getattr(conn, '_has_fts5', None)
+  if cached is not None:
+    return cached
+  available = _probe_fts5(conn)
+  if isinstance(conn, _Connection):
+    conn._has_fts5 = available
+  return available
+
+
 def now_iso() -> str:
   return datetime.now(timezone.utc).isoformat()
 
@@ -92,6 +202,32 @@ class Note:
   path: str
 
 
+def normalize_tags(tags: Iterable[str]) -> List[str]:
+  """Strip, drop empty and dedupe tags, sorted the way they are stored."""
+  return sorted({t.strip() for t in tags if t.strip()})
+
+
+_INSERT_SQL = (
+  'INSERT INTO notes(text, project, tags, created_at, path) '
+  'VALUES (?, ?, ?, ?, ?)'
+)
+
+
+def _insert_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+  if not isinstance(conn, _Connection):
+    return conn.cursor()
+  if conn._insert_cur is None:
+    conn._insert_cur = conn.cursor()
+  return conn._insert_cur
+
+
+def _note_params(
+  text: str, project: str, tags: Sequence[str], path: Path
+) -> Tuple[str, str, str, str, str]:
+  tags_str = ','.join(normalize_tags(tags))
+  return (text, project, tags_str, now_iso(), str(path))
+
+
 def insert_note(
   conn: sqlite3.Connection,
   text: str,
@@ -99,21 +235,48 @@ def insert_note(
   tags: Sequence[str],
   path: Path,
 ) -> int:
-  cur = conn.cursor()
-  created_at = now_iso()
-  tags_str = ','.join(sorted(set(tags)))
-  cur.execute(
-    'INSERT INTO notes(text, project, tags, created_at, path) VALUES (?, ?, ?, ?, ?)',
-    (text, project, tags_str, created_at, str(path)),
-  )
+  cur = _insert_cursor(conn)
+  cur.execute(_INSERT_SQL, _note_params(text, project, tags, path))
   conn.commit()
   return cast(int, cur.lastrowid)
 
 
+def insert_notes_bulk(
+  conn: sqlite3.Connection,
+  rows: Sequence[Tuple[str, str, Sequence[str], Path]],
+) -> List[int]:
+  """Insert many (text, project, tags, path) rows in a single transaction.
+
+  Returns the new note IDs in input order.
+  """
+  cur = _insert_cursor(conn)
+  ids: List[int] = []
+  # executemany() does not report per-row IDs, so execute per row but commit
+  # once; the commit (fsync) is what dominates.
+  with conn:
+    for text, project, tags, path in rows:
+      cur.execute(_INSERT_SQL, _note_params(text, project, tags, path))
+      ids.append(cast(int, cur.lastrowid))
+  return ids
+
+
 def iter_recent(conn: sqlite3.Connection, limit: int = 20) -> Iterable[Note]:
   cur = conn.cursor()
   cur.execute('SELECT * FROM notes ORDER BY id DESC LIMIT ?', (limit,))
-  for row in cur.fetchall():
+  for row in cur:
+    yield Note(**row)
+
+
+def iter_all_notes(
+  conn: sqlite3.Connection, project: Optional[str] = None
+) -> Iterable[Note]:
+  """Yield every note, oldest first, optionally limited to one project."""
+  cur = conn.cursor()
+  if project:
+    cur.execute('SELECT * FROM notes WHERE project = ? ORDER BY id', (project,))
+  else:
+    cur.execute('SELECT * FROM notes ORDER BY id')
+  for row in cur:
     yield Note(**row)
 
 
@@ -131,18 +294,46 @@ def delete_note(conn: sqlite3.Connection, note_id: int) -> bool:
   return cur.rowcount > 0
 
 
+def delete_notes(conn: sqlite3.Connection, note_ids: Sequence[int]) -> set[int]:
+  """Delete several notes in one transaction; return the IDs that existed."""
+  if not note_ids:
+    return set()
+  cur = conn.cursor()
+  found: set[int] = set()
+  # One lookup per ID avoids SQLite's bound-variable cap on an IN (...) list;
+  # the single commit at the end is what makes the batch cheap.
+  with conn:
+    for nid in note_ids:
+      cur.execute('SELECT 1 FROM notes WHERE id = ?', (nid,))
+      if cur.fetchone():
+        found.add(nid)
+    cur.executemany('DELETE FROM notes WHERE id = ?', [(nid,) for nid in found])
+  return found
+
+
 def top_tags(
   conn: sqlite3.Connection, limit: int = 20
 ) -> Iterable[Tuple[str, int]]:
   cur = conn.cursor()
-  cur.execute('SELECT tags FROM notes;')
-  counts: dict[str, int] = {}
-  for (tag_str,) in cur.fetchall():
-    for t in tag_str.split(','):
-      t = t.strip()
-      if t:
-        counts[t] = counts.get(t, 0) + 1
-  return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+  # Split the comma-separated tags column and count inside SQLite
+  cur.execute(
+    """
+        WITH RECURSIVE split(tag, rest) AS (
+            SELECT '', tags || ',' FROM notes
+            UNION ALL
+            SELECT trim(substr(rest, 1, instr(rest, ',') - 1)),
+                   substr(rest, instr(rest, ',') + 1)
+            FROM split WHERE rest <> ''
+        )
+        SELECT tag, COUNT(*) AS c FROM split
+        WHERE tag <> ''
+        GROUP BY tag
+        ORDER BY c DESC, tag
+        LIMIT ?;
+        """,
+    (limit,),
+  )
+  return [(tag, count) for tag, count in cur]
 
 
 def search_notes(
@@ -156,13 +347,11 @@ def search_notes(
   cur = conn.cursor()
   clauses = []
   params: list = []
+  use_fts = bool(query) and has_fts5(conn)
 
   # Decide search backend
-  if query and has_fts5(conn):
-    clauses.append(
-      'rowid IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)'
-    )
-    params.append(query)
+  if use_fts:
+    clauses.append('id IN (SELECT rowid FROM fts)')
   elif query:
     clauses.append('(text LIKE ? OR tags LIKE ?)')
     like = f'%{query}%'
@@ -186,5 +375,17 @@ def search_notes(
   where = ' AND '.join(clauses) if clauses else '1=1'
   sql = f'SELECT * FROM notes WHERE {where} ORDER BY id DESC LIMIT ?'
   params.append(limit)
+
+  if use_fts:
+    # Resolve FTS hits in their own CTE so extra filters on notes cannot
+    # pull the planner off the FTS index. Without filters the newest `limit`
+    # hits are the answer; with filters every hit stays a candidate.
+    fts_limit = -1 if len(clauses) > 1 else limit
+    sql = (
+      'WITH fts AS (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ? '
+      'ORDER BY rowid DESC LIMIT ?) ' + sql
+    )
+    params[:0] = [query, fts_limit]
+
   cur.execute(sql, params)
-  return [Note(**row) for row in cur.fetchall()]
+  return [Note(**row) for row in cur]
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 import pytest
 from typer.testing import CliRunner
 
-from thinkspace.storage import insert_note
+from thinkspace.storage import _reset_connection, insert_note
 
 
 @pytest.fixture()
@@ -16,13 +16,15 @@ def cli_runner() -> CliRunner:
 
 
 @pytest.fixture()
-def scoped_db(tmp_path, monkeypatch) -> Path:
+def scoped_db(tmp_path, monkeypatch) -> Iterator[Path]:
   """Point the app at an isolated data directory for each test."""
   data_root = tmp_path / 'data-home'
+  _reset_connection()
   monkeypatch.setattr(
     'thinkspace.storage.user_data_dir', lambda *_, **__: str(data_root)
   )
-  return data_root
+  yield data_root
+  _reset_connection()
 
 
 @pytest.fixture()
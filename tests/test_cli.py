@@ -71,3 +71,57 @@ def test_cli_delete_interactive_selection(
 
   with closing(connect()) as conn:
     assert get_note(conn, nid) is None
+
+
+def test_cli_search_and_list_show_text_verbatim(
+  scoped_db, cli_runner: CliRunner, insert_sample
+):
+  with closing(connect()) as conn:
+    insert_sample(conn, 'fix [bold]env[/bold] var issue')
+
+  found = cli_runner.invoke(cli_module.app, ['search', 'env'])
+  assert found.exit_code == 0
+  assert '[bold]env[/bold]' in found.stdout
+
+  listed = cli_runner.invoke(cli_module.app, ['list'])
+  assert listed.exit_code == 0
+  assert '[bold]env[/bold]' in listed.stdout
+
+
+def test_cli_export_writes_oldest_first(
+  scoped_db, cli_runner: CliRunner, insert_sample, tmp_path
+):
+  with closing(connect()) as conn:
+    first = insert_sample(conn, 'first note')
+    insert_sample(conn, 'elsewhere', project='other')
+    last = insert_sample(conn, 'last note')
+
+  out = tmp_path / 'export.md'
+  result = cli_runner.invoke(
+    cli_module.app, ['export', '--out', str(out), '--project', 'demo']
+  )
+  assert result.exit_code == 0
+  assert 'Exported 2 notes' in result.stdout
+
+  body = out.read_text(encoding='utf-8')
+  assert body.startswith('# 🧠 Thinkspace Export\n\n## Note #')
+  assert body.index(f'## Note #{first}') < body.index(f'## Note #{last}')
+  assert 'elsewhere' not in body
+  assert body.endswith('\nlast note\n')
+
+
+def test_cli_note_panel_shows_stored_tags(
+  scoped_db, cli_runner: CliRunner, monkeypatch
+):
+  monkeypatch.setattr(cli_module, 'detect_project', lambda: ('demo', scoped_db))
+  monkeypatch.setattr(cli_module, '_auto_time_tags', lambda dt=None: ['y:2024'])
+
+  result = cli_runner.invoke(
+    cli_module.app, ['note', 'hi', '-t', ' x ', '-t', '', '-t', 'x']
+  )
+  assert result.exit_code == 0
+  assert 'Tags: project:demo, x, y:2024' in result.stdout
+
+  with closing(connect()) as conn:
+    (note,) = iter_recent(conn, limit=1)
+    assert note.tags == 'project:demo,x,y:2024'
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from thinkspace.context import detect_project
+
+
+def test_detect_project_finds_git_root(tmp_path):
+  root = tmp_path / 'repo'
+  nested = root / 'pkg' / 'sub'
+  nested.mkdir(parents=True)
+  (root / '.git').mkdir()
+  (root / 'pkg' / 'pyproject.toml').touch()
+
+  assert detect_project(nested) == ('repo', root.resolve())
+
+
+def test_detect_project_accepts_git_file(tmp_path):
+  root = tmp_path / 'worktree'
+  root.mkdir()
+  (root / '.git').write_text('gitdir: /elsewhere\n')
+
+  assert detect_project(root) == ('worktree', root.resolve())
+
+
+def test_detect_project_falls_back_to_marker(tmp_path):
+  root = tmp_path / 'proj'
+  nested = root / 'src'
+  nested.mkdir(parents=True)
+  (root / 'pyproject.toml').touch()
+
+  assert detect_project(nested) == ('proj', root.resolve())
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import sqlite3
 from contextlib import closing
+from pathlib import Path
 
 from thinkspace.storage import (
+  _Connection,
   connect,
   delete_note,
+  delete_notes,
   get_note,
+  has_fts5,
+  insert_note,
+  insert_notes_bulk,
   iter_recent,
   search_notes,
+  top_tags,
 )
 
 
@@ -45,3 +53,177 @@ def test_search_notes_falls_back_to_like(scoped_db, insert_sample, monkeypatch):
     matches = search_notes(conn, 'beta', project=None, limit=5)
     assert len(matches) == 1
     assert matches[0].text == 'Alpha beta gamma'
+
+
+def test_has_fts5_uses_schema_bootstrap_result(scoped_db, monkeypatch):
+  calls: list[object] = []
+
+  def fake_probe(conn):
+    calls.append(conn)
+    return True
+
+  monkeypatch.setattr('thinkspace.storage._probe_fts5', fake_probe)
+  with closing(connect()) as conn:
+    assert has_fts5(conn) is True
+    assert has_fts5(conn) is True
+  assert calls == []
+
+
+def test_has_fts5_probes_other_connections_once(monkeypatch):
+  calls: list[object] = []
+
+  def fake_probe(conn):
+    calls.append(conn)
+    return False
+
+  monkeypatch.setattr('thinkspace.storage._probe_fts5', fake_probe)
+  with closing(sqlite3.connect(':memory:', factory=_Connection)) as conn:
+    assert has_fts5(conn) is False
+    assert has_fts5(conn) is False
+  assert len(calls) == 1
+
+
+def test_connect_reuses_connection_until_closed(scoped_db):
+  conn = connect()
+  assert connect() is conn
+  conn.close()
+  with closing(connect()) as reopened:
+    assert reopened is not conn
+    assert reopened.execute('SELECT 1').fetchone()[0] == 1
+
+
+def test_top_tags_counts_and_orders(scoped_db):
+  with closing(connect()) as conn:
+    insert_note(conn, 'one', 'demo', ['b', 'a', ' c '], Path('.'))
+    insert_note(conn, 'two', 'demo', ['a', 'b'], Path('.'))
+    insert_note(conn, 'three', 'demo', ['a'], Path('.'))
+    assert top_tags(conn) == [('a', 3), ('b', 2), ('c', 1)]
+    assert top_tags(conn, limit=1) == [('a', 3)]
+
+
+def test_search_notes_fts_limit_and_filters(scoped_db, insert_sample):
+  with closing(connect()) as conn:
+    demo_ids = [insert_sample(conn, f'todo item {i}') for i in range(3)]
+    other_id = insert_sample(conn, 'todo elsewhere', project='other')
+    newest = search_notes(conn, 'todo', limit=2)
+    assert [n.id for n in newest] == [other_id, demo_ids[-1]]
+    filtered = search_notes(conn, 'todo', project='demo', limit=5)
+    assert [n.id for n in filtered] == demo_ids[::-1]
+
+
+def test_insert_notes_bulk_returns_ids_in_order(scoped_db):
+  with closing(connect()) as conn:
+    ids = insert_notes_bulk(
+      conn,
+      [
+        (f'bulk {idx}', 'demo', ['project:demo'], Path('.')) for idx in range(5)
+      ],
+    )
+    assert len(ids) == 5
+    assert [n.id for n in iter_recent(conn, limit=5)] == ids[::-1]
+    assert get_note(conn, ids[2]).text == 'bulk 2'
+
+
+def test_delete_notes_reports_existing_ids(scoped_db, insert_sample):
+  with closing(connect()) as conn:
+    keep = insert_sample(conn, 'keep me')
+    gone = [insert_sample(conn, f'drop {idx}') for idx in range(3)]
+    assert delete_notes(conn, [*gone, 9999]) == set(gone)
+    assert delete_notes(conn, gone) == set()
+    assert delete_notes(conn, []) == set()
+    assert [n.id for n in iter_recent(conn)] == [keep]
+    assert search_notes(conn, 'drop') == []
+
+
+def test_insert_note_normalizes_tags(scoped_db):
+  with closing(connect()) as conn:
+    nid = insert_note(
+      conn, 'tagged', 'demo', ['b', ' a ', 'b', '', '  '], Path('.')
+    )
+    assert get_note(conn, nid).tags == 'a,b'
+
+
+def test_search_notes_folds_diacritics(scoped_db, insert_sample):
+  with closing(connect()) as conn:
+    nid = insert_sample(conn, 'Meet at the café')
+    assert [n.id for n in search_notes(conn, 'cafe')] == [nid]
+    assert [n.id for n in search_notes(conn, 'caf*')] == [nid]
+
+
+def _write_legacy_db(data_root) -> None:
+  data_root.mkdir(parents=True, exist_ok=True)
+  with closing(sqlite3.connect(data_root / 'notes.db')) as legacy:
+    legacy.executescript(
+      """
+      CREATE TABLE notes(
+          id INTEGER PRIMARY KEY,
+          text TEXT NOT NULL,
+          project TEXT NOT NULL,
+          tags TEXT NOT NULL,
+          created_at TEXT NOT NULL,
+          path TEXT NOT NULL
+      );
+      CREATE VIRTUAL TABLE notes_fts
+      USING fts5(text, project, tags, content='notes', content_rowid='id');
+      INSERT INTO notes VALUES (1, 'résumé draft', 'demo', '', '2024', '.');
+      INSERT INTO notes_fts(notes_fts) VALUES('rebuild');
+      """
+    )
+
+
+def test_connect_migrates_legacy_fts_table(scoped_db):
+  _write_legacy_db(scoped_db)
+
+  with closing(connect()) as conn:
+    (sql,) = conn.execute(
+      "SELECT sql FROM sqlite_master WHERE name = 'notes_fts'"
+    ).fetchone()
+    assert 'remove_diacritics' in sql
+    assert [n.id for n in search_notes(conn, 'resume')] == [1]
+
+
+_REJECTED_DDL = (
+  'CREATE VIRTUAL TABLE notes_fts USING fts5(text, tokenize=no_such_tokenizer);'
+)
+
+
+def test_connect_falls_back_to_compatible_fts_ddl(scoped_db, monkeypatch):
+  monkeypatch.setattr('thinkspace.storage._FTS_DDL', _REJECTED_DDL)
+  _write_legacy_db(scoped_db)
+
+  with closing(connect()) as conn:
+    (sql,) = conn.execute(
+      "SELECT sql FROM sqlite_master WHERE name = 'notes_fts'"
+    ).fetchone()
+    assert 'remove_diacritics 1' in sql
+    assert has_fts5(conn) is True
+    assert [n.id for n in search_notes(conn, 'resume')] == [1]
+
+
+def test_connect_keeps_legacy_fts_table_when_ddl_rejected(
+  scoped_db, insert_sample, monkeypatch
+):
+  monkeypatch.setattr('thinkspace.storage._FTS_DDL', _REJECTED_DDL)
+  monkeypatch.setattr('thinkspace.storage._FTS_DDL_COMPAT', _REJECTED_DDL)
+  _write_legacy_db(scoped_db)
+
+  with closing(connect()) as conn:
+    (sql,) = conn.execute(
+      "SELECT sql FROM sqlite_master WHERE name = 'notes_fts'"
+    ).fetchone()
+    assert 'tokenize' not in sql
+    assert has_fts5(conn) is True
+    nid = insert_sample(conn, 'fresh legacy entry')
+    assert [n.id for n in search_notes(conn, 'legacy')] == [nid]
+    assert [n.id for n in search_notes(conn, 'draft')] == [1]
+
+
+def test_delete_notes_handles_more_ids_than_sqlite_variables(scoped_db):
+  with closing(connect()) as conn:
+    if hasattr(conn, 'setlimit'):  # Python 3.11+: mimic SQLite < 3.32
+      conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    ids = insert_notes_bulk(
+      conn, [(f'n{idx}', 'demo', [], Path('.')) for idx in range(1200)]
+    )
+    assert delete_notes(conn, [*ids, *range(100_000, 100_500)]) == set(ids)
+    assert list(iter_recent(conn)) == []